@@ -6,15 +6,50 @@
 # Kerry S. Martin, martin@wild-wood.net
 # 2024-02-15
 
+import os
+import ntpath      # basename of both Windows (\) and POSIX (/) paths, on any platform
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.ticker import ScalarFormatter
-from mpl_toolkits.axisartist.axislines import SubplotZero
 from enum import Enum
+import functools
+import contextlib
+import concurrent.futures
+import io
 import zipfile
 import re
 import locale
 
+# figures are shown on screen (plt.show) when ISO_INTERACTIVE is set, otherwise only saved
+_INTERACTIVE = bool(os.environ.get("ISO_INTERACTIVE"))
+
+# DC plots draw their axes through zero; disabled, DC plots use the same axes as AC plots
+_DC_AXES_AT_ZERO = False
+
+# zlib level of PNG figures; 1 is much faster to save than the default 6, files are a little larger
+PNG_COMPRESS_LEVEL = 1
+
+# files stored in the zip archive without compression, their data is already deflate compressed
+_ZIP_STORED_EXT = (".png",)
+
+
+def _workers():
+    # processes drawing the figures, opt-in with ISO_WORKERS; each worker takes about 0.5 s to
+    # start, several times the cost of drawing a plot, so by default (or when the setting is not
+    # a number) they are drawn in this process
+    try:
+        workers = int(os.environ.get("ISO_WORKERS", 1))
+    except ValueError:
+        workers = 1
+    return max(1, min(workers, os.cpu_count() or 1))
+
+
+def _zip_compress_type(shortname):
+    # None keeps the deflate compression of the archive
+    return zipfile.ZIP_STORED if shortname.lower().endswith(_ZIP_STORED_EXT) else None
+
+
+# name of a standard, see ISO_Plots.split_std_number
+_STD_NUMBER_RE = re.compile(r"^(?:ISO\s+)?([1-9][0-9]*(?:[-_][1-9][0-9]*)?)\s*((?:ed\s*[1-9][0-9]*)?)$", re.IGNORECASE)
+
 
 #
 class FilenamingStyle(Enum):
@@ -22,36 +57,49 @@ class FilenamingStyle(Enum):
     ISO_IMPROVED_STYLE = 1
 
 
-# class decorator
-def static_init(cls):
-    if getattr(cls, "static_init", None):
-        cls.static_init()
-    return cls
-
-
-@static_init
 class ISO_Plots:
 
+    _style_set = False    # locale and rcParams configured for the whole process, see static_init
+
     # ==========================================================================
     # Static initializer - setup plot settings
     # ==========================================================================
 
     @classmethod
     def static_init(cls):
-        # called once automatically to configure locale and font settings
+        # called once by each worker process to configure locale and font settings for the
+        # whole process; the calling process only has them set while it draws (see iso_style)
+        if cls._style_set:
+            return
+        cls._style_set = True
+        cls.set_style()
+
+
+    @staticmethod
+    def set_style():
+        # matplotlib is imported when the first plot is drawn, the limit helpers do not need it
+        import matplotlib
 
         # Set to German locale to get comma decimal separater
         locale.setlocale(locale.LC_NUMERIC, "de_DE")
-        plt.rcdefaults()
+        matplotlib.rcdefaults()
 
         # Tell matplotlib to use the locale we set above
-        plt.rcParams['axes.formatter.use_locale'] = True
+        matplotlib.rcParams['axes.formatter.use_locale'] = True
 
         # Say, "the default sans-serif font is COMIC SANS"
-        plt.rcParams['font.serif'] = "Cambria"  # ISO standard figure font
+        matplotlib.rcParams['font.serif'] = "Cambria"  # ISO standard figure font
 
         # Then, "ALWAYS use sans-serif fonts"
-        plt.rcParams['font.family'] = "serif"
+        matplotlib.rcParams['font.family'] = "serif"
+
+        # Simplify line paths so the densely sampled curves draw fewer vertices
+        matplotlib.rcParams['path.simplify'] = True
+        matplotlib.rcParams['path.simplify_threshold'] = 1.0
+
+        # Use repeatable SVG element ids; text stays embedded as glyph paths (svg.fonttype 'path')
+        # so the figures look the same without the fonts installed
+        matplotlib.rcParams['svg.hashsalt'] = '0'
 
 
     # ==========================================================================
@@ -74,7 +122,10 @@ class ISO_Plots:
         self.appendix = None
         self.filename_style = filename_style
         self.key_table = []
-        self.zip_file_list = []
+        self.zip_file_list = []       # file paths read from disk when zipped, or (name, data) already in memory
+        self._plot_specs = []         # plots queued by ISO_Plot, drawn by ISO_Wrapup
+        self._io_pool = None          # writes the figure files, created when plots are drawn, shut down by ISO_Wrapup
+        self._io_futures = []
 
 
     # ==========================================================================
@@ -111,7 +162,7 @@ class ISO_Plots:
             filename: Full path to the file location. May be of any type.
             skip: Number of figures to skip. Defaults to 1. Change to 0 to prevent skipping a number.
         """
-        self.__AddFileToZip(filename)
+        self.zip_file_list.append(filename)
         self.ISO_Skip_Figure(skip)
 
 
@@ -156,10 +207,8 @@ class ISO_Plots:
 
     def __CreateKeyTable(self):
         keyfilename = f"{self.fig_dir}{self.std_name}_(E)_KEYS.txt"
-        fh = open(keyfilename, "w")
-        for line in self.key_table:
-            fh.write(line)
-        fh.close()
+        with open(keyfilename, "w", buffering=1<<20) as fh:
+            fh.write("".join(self.key_table))
         return keyfilename
 
 
@@ -167,19 +216,18 @@ class ISO_Plots:
     # Generate zip archive
     # ==========================================================================
 
-    def __AddFileToZip(self, filename=None):
-        if filename is not None:
-            self.zip_file_list.append(filename)
-
-
     def __CreateZipArchive(self):
         zip_filename = f"{self.fig_dir}FIGURES-{self.std_name}_(E).zip"
-        zip = zipfile.ZipFile(zip_filename, mode="w")
-        for filename in self.zip_file_list:
-            m = re.search(r"[^\\]+$", filename)
-            shortname = m.group(0)
-            zip.write(filename, arcname=shortname)
-        zip.close()
+        with open(zip_filename, "wb", buffering=1<<20) as fh, \
+             zipfile.ZipFile(fh, mode="w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zip:
+            for entry in self.zip_file_list:
+                if type(entry) is tuple:
+                    shortname, data = entry
+                    zip.writestr(shortname, data, compress_type=_zip_compress_type(shortname))
+                else:
+                    # streamed from the file, keeping its modification time
+                    shortname = ntpath.basename(entry)
+                    zip.write(entry, shortname, compress_type=_zip_compress_type(shortname))
 
 
     # ==========================================================================
@@ -207,17 +255,40 @@ class ISO_Plots:
         return savename
 
 
-    def __FigSave(self, fig, figname=None):
-        savename = self.__FigFilename(fig, figname)
-        plt.savefig(savename)
-        self.__AddFileToZip(savename)
+    @staticmethod
+    def __WriteFile(filename, data):
+        with open(filename, "wb") as fh:
+            fh.write(data)
+
+
+    def __RenderPlots(self):
+        # draw every queued plot, then write the file in the background
+        specs = self._plot_specs
+        self._plot_specs = []
+        jobs = [(self.fig_fmt, y, f, kwargs) for index, savename, y, f, kwargs in specs]
+        workers = min(_workers(), len(jobs))
+        if workers>1 and not _INTERACTIVE:
+            # the plots are independent, each worker process reuses its own figure
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=ISO_Plots.static_init) as pool:
+                rendered = list(pool.map(_render_job, jobs))
+        else:
+            with iso_style():
+                rendered = list(map(_render_job, jobs))
+        if self._io_pool is None:
+            self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        for (index, savename, y, f, kwargs), data in zip(specs, rendered):
+            self._io_futures.append(self._io_pool.submit(self.__WriteFile, savename, data))
+            self.zip_file_list[index] = (ntpath.basename(savename), data)
 
 
     def ISO_Plot(self, fun, is_dc=False, title=None, abbr=None, unit=None, logx=True, xlim=None, ylim=None, yticks=None, xypass=None, xyfail=None, xyfail2=None, xybetter=None, dbetter=None, fig=None, figname=None, show=False):
         """Generate a plot for an ISO standard
 
+        The figure number, keys and file name are assigned here; the figure itself
+        is drawn and saved by ISO_Wrapup (or right away when it is shown).
+
         Args:
-            fun: Function to be plotted.
+            fun: Function to be plotted. fun() returns (y, f); y is 1-D, or 2-D (one column per trace).
             is_dc: Is it a DC plot (0 Hz)? Defaults to False.
             title: Title of the display on the plot. Defaults to None.
             abbr: Abbreviated Y axis quantity, used to generate the key file. Defaults to None.
@@ -234,6 +305,7 @@ class ISO_Plots:
             fig: Figure number to set. Defaults to None which auto numbers.
             figname: Name of the plot used for filename generation. Defaults to None.
             show: Show the figure, or just save it? Defaults to False (do not show)
+                  Only honored when the ISO_INTERACTIVE environment variable is set
 
             [] or () parameters
               [x, y] = coordinates in terms of axis quantities
@@ -241,92 +313,12 @@ class ISO_Plots:
         """
         y, f = fun()
 
-        if type(y[0]) is tuple:
-            is_multi = True
-            n_traces = len(y[0])
-            y = map(np.array, y)
-            y = np.array(list(y))
-        else:
-            is_multi = False
+        # multiple traces are returned as a 2-D array, one column per trace
+        y = np.asarray(y, dtype=np.float64)
 
-        fh = plt.figure()
-        ax = SubplotZero(fh, 111)
-        fh.add_subplot(ax)
-        trans = ax.transAxes
-        if False:
-            # TODO: may need to improve the DC (for now it is same as AC plots)
-            for dir in ["yzero", "bottom"]:
-                ax.axis[dir].set_axisline_style("-|>")
-                ax.axis[dir].set_visible(True)
-            for dir in ["left", "right", "top"]:
-                ax.axis[dir].set_visible(False)
-        else:
-            for dir in ["left", "bottom"]:
-                ax.axis[dir].set_axisline_style("-|>")
-                ax.axis[dir].set_visible(True)
-            for dir in ["right", "top"]:
-                ax.axis[dir].set_visible(False)
-
-        if is_dc:
-            fd = np.max(f)-np.min(f)
-            fc = 0.5*(np.max(f)+np.min(f))
-            f1, f2 = fc-fd, fc+fd
-
-            if is_multi:
-                for idx in range(n_traces):
-                    yt = y[:,idx]
-                    plt.semilogy(f, yt, 'b-')
-            else:
-                plt.semilogy(f, y, 'b-')
-
-        else:
-            f1, f2 = np.min(f), 1000.0
-            if f1<10.0:
-                f1 = 1.0
-            elif f1<100.0:
-                f1 = 10.0
-            else:
-                f1 = 100.0
-
-            if is_multi:
-                for idx in range(n_traces):
-                    yt = y[:,idx]
-                    if logx:
-                        plt.semilogx(f,yt)
-                    else:
-                        plt.plot(f,yt)
-            else:
-                if logx:
-                    plt.semilogx(f, y)
-                else:
-                    plt.plot(f,y)
-
-        if xlim is not None:
-            plt.xlim(xlim)
-        else:
-            plt.xlim([f1, f2])
-        if ylim is not None:
-            plt.ylim(ylim)
-        if yticks is not None:
-            ax.set_yticks(yticks[0], yticks[1])
-
-        if title is not None:
-            if isinstance(title, tuple) and len(title)==0:
-                # an empty tuple () simply uses the figname for the title
-                plt.title(figname, weight='bold')
-            else:
-                plt.title(title, weight='bold')
-
-        ax.set_xlabel('F (MHz)')
-
-        if abbr is not None:
-            Yab = abbr
-        else:
-            Yab = 'Y'
-        if unit is not None:
-            ax.set_ylabel(f'{Yab} ({unit})')
-        else:
-            ax.set_ylabel(Yab)
+        for name, xy in (("xypass", xypass), ("xyfail", xyfail), ("xyfail2", xyfail2), ("xybetter", xybetter)):
+            if xy is not None and not isinstance(xy, (tuple, list)):
+                raise Exception(f"Unsupported '{name}'")
 
         if abbr is not None and unit is not None:
             vunit = f'{abbr} ({unit})'
@@ -335,74 +327,23 @@ class ISO_Plots:
         else:
             vunit = f'{abbr}'
 
-        plt.gca().xaxis.set_major_formatter(ScalarFormatter())
-        plt.grid(visible=True, which='both')
-
         key_num = 1
         key_pass = None
         key_fail = None
         key_better = None
 
         if xypass is not None:
-            if type(xypass) is tuple:
-                key_pass = key_num
-                x, y = xypass
-                ax.text(x, y, f"({key_pass})", transform=trans, weight="bold", size=16, ha='center', va='center', color='gray')
-                key_num += 1
-            elif type(xypass) is list:
-                key_pass = key_num
-                x, y = xypass[0], xypass[1]
-                ax.text(x, y, f"({key_pass})", weight="bold", size=16, ha='center', va='center', color='gray')
-                key_num += 1
-            else:
-                raise Exception("Unsupported 'xypass'")
-
+            key_pass = key_num
+            key_num += 1
         if xyfail is not None:
-            if type(xyfail) is tuple:
-                key_fail = key_num
-                x, y = xyfail
-                ax.text(x, y, f"({key_fail})", transform=trans, weight="bold", size=16, ha='center', va='center', color='gray')
-                key_num += 1
-            elif type(xyfail) is list:
-                key_fail = key_num
-                x, y = xyfail[0], xyfail[1]
-                ax.text(x, y, f"({key_fail})", weight="bold", size=16, ha='center', va='center', color='gray')
-                key_num += 1
-            else:
-                raise Exception("Unsupported 'xyfail'")
-
-        if xyfail2 is not None:
-            if type(xyfail2) is tuple:
-                if key_fail is None:
-                    key_fail = key_num
-                    key_num += 1
-                x, y = xyfail2
-                ax.text(x, y, f"({key_fail})", transform=trans, weight="bold", size=16, ha='center', va='center', color='gray')
-            elif type(xyfail2) is list:
-                if key_fail is None:
-                    key_fail = key_num
-                    key_num += 1
-                x, y = xyfail2[0], xyfail2[1]
-                ax.text(x, y, f"({key_fail})", weight="bold", size=16, ha='center', va='center', color='gray')
-            else:
-                raise Exception("Unsupported 'xyfail2'")
-
+            key_fail = key_num
+            key_num += 1
+        if xyfail2 is not None and key_fail is None:
+            key_fail = key_num
+            key_num += 1
         if xybetter is not None:
             key_better = key_num
             key_num += 1
-            tbetter = f"({key_better})"
-            boxstyle = 'rarrow' if dbetter is None or dbetter>0 else 'larrow'
-            if type(xybetter) is tuple:
-                x, y = xybetter
-                ax.text(x, y, tbetter, color='gray', ha='center', va='center', rotation=90, size=16, bbox=dict(boxstyle=boxstyle, ec='gray', fc='white'), transform=trans)
-            elif type(xybetter) is list:
-                x, y = xybetter[0], xybetter[1]
-                ax.text(x, y, tbetter, color='gray', ha='center', va='center', rotation=90, size=16, bbox=dict(boxstyle=boxstyle, ec='gray', fc='white'))
-            else:
-                raise Exception("Unsupported 'xybetter'")
-
-        if is_dc:
-            plt.xticks([0.0], ['0'])
 
         if fig is None:
             fig = self.__next_figure()
@@ -417,54 +358,81 @@ class ISO_Plots:
         if key_better is not None:
             self.__AddKeyToFigure(fig, f"({key_better})", "Better")
 
-        self.__FigSave(fig, figname)
-
-        if show:
-            plt.show()
+        # reserve the zip entry now so the archive keeps the figure order
+        self.zip_file_list.append(None)
+        kwargs = dict(keys=(key_pass, key_fail, key_better), is_dc=is_dc, title=title, abbr=abbr, unit=unit, logx=logx,
+                      xlim=xlim, ylim=ylim, yticks=yticks, xypass=xypass, xyfail=xyfail, xyfail2=xyfail2,
+                      xybetter=xybetter, dbetter=dbetter, figname=figname)
+        savename = self.__FigFilename(fig, figname)
+        kwargs["filename"] = ntpath.basename(savename)
+        self._plot_specs.append((len(self.zip_file_list)-1, savename, y, f, kwargs))
 
-        plt.close()
+        if show and _INTERACTIVE:
+            self.__RenderPlots()
+            with iso_style():
+                _pyplot().show()
 
 
     def ISO_Wrapup(self):
         """Call this after creating all plots to finish up and write a zip file
+
+        The queued plots are drawn in this process, or by a pool of ISO_WORKERS processes
+        when that is set above 1 (limited to the number of CPUs). Where processes are spawned
+        (Windows, macOS), the calling script must then guard its main program with
+        if __name__ == "__main__".
         """
-        self.__AddFileToZip(self.__CreateKeyTable())
+        self.__RenderPlots()
+        _close_axes()
+
+        # all figure files must be written before they are zipped
+        for future in self._io_futures:
+            future.result()
+        self._io_futures = []
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=True)
+            self._io_pool = None
+
+        self.zip_file_list.append(self.__CreateKeyTable())
         self.__CreateZipArchive()
 
 
     # y = feval(x, fun)
     #
     # Description:
-    #   Evaluates the given function at every point in 1D array x
+    #   Evaluates the given function at every point in array x (or a single float)
+    #   A vectorized function is called once with the whole array, others once per element
     #
     @staticmethod
     def feval(x, fun):
         """Helper function used to evaluate a function at one or more x values
 
         Args:
-            x: float or np.ndarray value(s) to evaluate function at
-            fun: function taking and returing a single float
+            x: float, or np.ndarray (or any array-like, e.g. a list) value(s) to evaluate function at
+            fun: function taking and returning a float, or also np.ndarray if marked
+                 vectorized (see cache_default). Otherwise it is called once per element
+                 with a Python float, and a None return is mapped to NaN.
 
         Raises:
-            Exception: if X is not a valid type (float or np.ndarray)
+            Exception: if X is not a valid type (int, float or array of them), e.g. None
 
         Returns:
-            float or np.ndarray depending upon the x argument
-            with evaluated fun(x)
+            float (or None outside the range of a limit) for a single x value,
+            np.ndarray with evaluated fun(x) otherwise
         """
-        if type(x) is float:
+        # None, strings and object arrays are rejected before converting, np.asarray would take None as NaN
+        xa = np.asarray(x)
+        if xa.dtype.kind not in "iuf":
+            raise Exception("Invalid type for x. Accepts float and ndarray of float")
+        x = xa.astype(np.float64, copy=False)
+
+        if x.ndim==0:
+            y = fun(float(x))
+            if y is not None and np.ndim(y)==0:
+                y = float(y)
+        elif getattr(fun, "_vectorized", False):
             y = fun(x)
-        elif type(x) is np.ndarray:
-            y = None
-            it = np.nditer(x, flags=["f_index"])
-            for xx in it:
-                i = it.index
-                v = fun(float(xx))
-                if y is None:
-                    y = np.empty(x.shape, dtype=type(v))
-                y[i] = v
         else:
-            raise Exception("Invalid type for x. Accepts float and ndarray of float")
+            y = np.fromiter((np.nan if v is None else v for v in map(fun, x.ravel().tolist())), dtype=np.float64, count=x.size).reshape(x.shape)
 
         return y
 
@@ -478,7 +446,7 @@ class ISO_Plots:
     @staticmethod
     def split_std_number(std):
         # ^(?:ISO\s+)?([1-9][0-9]*(?:[-_][1-9][0-9]*)?)\s*((?:ed\s*[1-9][0-9]*)?)$
-        m = re.search(r"^(?:ISO\s+)?([1-9][0-9]*(?:[-_][1-9][0-9]*)?)\s*((?:ed\s*[1-9][0-9]*)?)$", std, re.IGNORECASE)
+        m = _STD_NUMBER_RE.search(std)
         if m is not None:
             stdnum = m.group(1)   # need to convert - to _
             edition = m.group(2)  # need to remove spaces and convert to lower
@@ -492,4 +460,303 @@ class ISO_Plots:
         return (stdnum, edition)
 
 
+# ==============================================================================
+# Plot rendering
+# ==============================================================================
+
+def _pyplot():
+    # pyplot is only used to show figures in interactive sessions, with the program's own backend;
+    # batch figures are drawn on a Figure with its own Agg canvas and leave the backend alone
+    import matplotlib.pyplot as plt
+    return plt
+
+
+@contextlib.contextmanager
+def iso_style():
+    """Context manager setting the locale and rcParams of the ISO figures
+
+    The LC_NUMERIC locale and all rcParams are restored on exit, so the calling
+    program is not left with the German locale or the figure fonts.
+    """
+    import matplotlib
+    old_locale = locale.setlocale(locale.LC_NUMERIC)
+    try:
+        with matplotlib.rc_context():
+            ISO_Plots.set_style()
+            yield
+    finally:
+        locale.setlocale(locale.LC_NUMERIC, old_locale)
+
+
+_plot_axes = None   # (figure, axes, x formatter), created once and reused for every plot
+
+# text of the pass/fail labels, and of the "better" label
+_KEY_TEXT_KW = dict(weight="bold", size=16, ha='center', va='center', color='gray')
+_BETTER_TEXT_KW = dict(color='gray', ha='center', va='center', rotation=90, size=16)
+
+# box of the "better" label, an arrow pointing the better direction
+_BETTER_BBOX_R = dict(boxstyle='rarrow', ec='gray', fc='white')
+_BETTER_BBOX_L = dict(boxstyle='larrow', ec='gray', fc='white')
+
+
+def _reuse_axes():
+    # create the figure and axes on first use, then clear and reuse them for every plot
+    global _plot_axes
+    if _plot_axes is not None and _INTERACTIVE and not _pyplot().fignum_exists(_plot_axes[0].number):
+        _plot_axes = None     # its window was closed after plt.show(), pyplot has destroyed the figure
+    if _plot_axes is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.ticker import ScalarFormatter
+        from mpl_toolkits.axisartist.axislines import SubplotZero
+        if _INTERACTIVE:
+            fh = _pyplot().figure()     # managed by pyplot so plt.show() can display it
+        else:
+            fh = Figure()
+            FigureCanvasAgg(fh)   # drawn and saved without pyplot
+        ax = SubplotZero(fh, 111)
+        fh.add_subplot(ax)
+        _plot_axes = (fh, ax, ScalarFormatter())
+    else:
+        _plot_axes[1].cla()
+    return _plot_axes
+
+
+def _close_axes():
+    global _plot_axes
+    if _plot_axes is not None:
+        if _INTERACTIVE:
+            _pyplot().close(_plot_axes[0])
+        _plot_axes = None
+
+
+def _place_label(ax, xy, label, **kwargs):
+    # a tuple places the label in scaled axes coordinates (0.0 - 1.0), a list in axis quantities
+    if isinstance(xy, tuple):
+        kwargs['transform'] = ax.transAxes
+    ax.text(xy[0], xy[1], label, **kwargs)
+
+
+def _render_job(job):
+    # worker entry point, job is (fig_fmt, y, f, kwargs)
+    fig_fmt, y, f, kwargs = job
+    return _render_plot(fig_fmt, y, f, **kwargs)
+
+
+def _render_plot(fig_fmt, y, f, keys, is_dc, title, abbr, unit, logx, xlim, ylim, yticks, xypass, xyfail, xyfail2, xybetter, dbetter, figname, filename):
+    # draw one plot queued by ISO_Plots.ISO_Plot and return the contents of its figure file
+    key_pass, key_fail, key_better = keys
+
+    fh, ax, xfmt = _reuse_axes()
+
+    if is_dc and _DC_AXES_AT_ZERO:
+        # TODO: may need to improve the DC (for now it is same as AC plots)
+        for dir in ["yzero", "bottom"]:
+            ax.axis[dir].set_axisline_style("-|>")
+            ax.axis[dir].set_visible(True)
+        for dir in ["left", "right", "top"]:
+            ax.axis[dir].set_visible(False)
+    else:
+        for dir in ["left", "bottom"]:
+            ax.axis[dir].set_axisline_style("-|>")
+            ax.axis[dir].set_visible(True)
+        for dir in ["right", "top"]:
+            ax.axis[dir].set_visible(False)
+
+    if is_dc:
+        fmin, fmax = np.min(f), np.max(f)
+        fd = fmax-fmin
+        fc = 0.5*(fmax+fmin)
+        f1, f2 = fc-fd, fc+fd
+
+        ax.semilogy(f, y, 'b-')
+
+    else:
+        f1, f2 = np.min(f), 1000.0
+        if f1<10.0:
+            f1 = 1.0
+        elif f1<100.0:
+            f1 = 10.0
+        else:
+            f1 = 100.0
+
+        if logx:
+            ax.semilogx(f, y)
+        else:
+            ax.plot(f, y)
+
+    if xlim is not None:
+        ax.set_xlim(xlim)
+    else:
+        ax.set_xlim([f1, f2])
+    if ylim is not None:
+        ax.set_ylim(ylim)
+    if yticks is not None:
+        ax.set_yticks(yticks[0], yticks[1])
+
+    if title is not None:
+        if isinstance(title, tuple) and len(title)==0:
+            # an empty tuple () simply uses the figname for the title
+            ax.set_title(figname, weight='bold')
+        else:
+            ax.set_title(title, weight='bold')
+
+    ax.set_xlabel('F (MHz)')
+
+    if abbr is not None:
+        Yab = abbr
+    else:
+        Yab = 'Y'
+    if unit is not None:
+        ax.set_ylabel(f'{Yab} ({unit})')
+    else:
+        ax.set_ylabel(Yab)
+
+    ax.xaxis.set_major_formatter(xfmt)
+    ax.grid(visible=True, which='both')
+
+    if xypass is not None:
+        _place_label(ax, xypass, f"({key_pass})", **_KEY_TEXT_KW)
+
+    if xyfail is not None:
+        _place_label(ax, xyfail, f"({key_fail})", **_KEY_TEXT_KW)
+
+    if xyfail2 is not None:
+        _place_label(ax, xyfail2, f"({key_fail})", **_KEY_TEXT_KW)
+
+    if xybetter is not None:
+        bbox = _BETTER_BBOX_R if dbetter is None or dbetter>0 else _BETTER_BBOX_L
+        _place_label(ax, xybetter, f"({key_better})", bbox=bbox, **_BETTER_TEXT_KW)
+
+    if is_dc:
+        ax.set_xticks([0.0], ['0'])
+
+    buf = io.BytesIO()
+    if fig_fmt==".svg":
+        fh.savefig(buf, format="svg", metadata={'Creator': None, 'Date': None})
+    elif fig_fmt==".png":
+        fh.savefig(buf, format="png", metadata={'Software': None}, pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL, 'optimize': False})
+    elif fig_fmt in (".eps", ".ps"):
+        # saved to memory, the backend has no file name for the %%Title comment; add it ahead
+        # of %%Creator, where the backend writes it when saving to a file
+        fh.savefig(buf, format=fig_fmt.lstrip("."))
+        title = f"%%Title: {filename}\n".encode("ascii", "replace")
+        return buf.getvalue().replace(b"%%Creator:", title + b"%%Creator:", 1)
+    else:
+        fh.savefig(buf, format=fig_fmt.lstrip("."))
+    return buf.getvalue()
+
+
+# ==============================================================================
+# Limit function helpers
+# ==============================================================================
+
+def cache_default(fun):
+    """Decorator caching the default samples of a limit function
+
+    The (y, f) pair returned by fun() is computed once and returned on every
+    later call with f=None. The cached arrays are made read-only. The wrapped
+    function is marked vectorized so feval hands it whole arrays.
+
+    Args:
+        fun: limit function following the f=None / np.ndarray / float convention
+
+    Returns:
+        wrapped limit function
+    """
+    @functools.lru_cache(maxsize=None)
+    def default():
+        y, f = fun()
+        y.setflags(write=False)
+        f.setflags(write=False)
+        return y, f
+
+    @functools.wraps(fun)
+    def limit(f=None):
+        if f is None:
+            return default()
+        return fun(f)
+    limit._vectorized = True
+    return limit
+
+
+def limit(fmin, fmax, default_f):
+    """Decorator creating a limit function from the expression of the limit
+
+    The decorated core(f) evaluates the limit over a float64 ndarray within the
+    range; the range checks and the f=None / np.ndarray / float dispatch are
+    handled here, and the default samples are cached (see cache_default).
+
+    Args:
+        fmin: lowest frequency the limit is defined at
+        fmax: highest frequency the limit is defined at
+        default_f: frequencies of the default samples (e.g., the corner frequencies)
+
+    Returns:
+        decorator returning the limit function. It returns (y, f) at default_f for
+        f=None, NaN outside the range for an array (or any array-like), and None
+        outside the range for a scalar.
+    """
+    default_f = np.asarray(default_f, dtype=np.float64)
+
+    def decorator(core):
+        @cache_default
+        @functools.wraps(core)
+        def limit_fun(f=None):
+            if f is None:
+                return limit_fun(default_f), default_f
+            # lists, pandas series and numpy scalars are all taken as arrays
+            f = np.asarray(f, dtype=np.float64)
+            if f.ndim==0:
+                if f<fmin or f>fmax:
+                    return None
+                return core(f.reshape(1))[0]
+            # samples outside the range are discarded, so are any warnings computing them
+            with np.errstate(divide='ignore', invalid='ignore'):
+                y = core(f)
+            out_of_range = (f<fmin) | (f>fmax)
+            if out_of_range.any():
+                y = np.where(out_of_range, np.nan, y)
+            return y
+        return limit_fun
+    return decorator
+
+
+def log_segments(f, bp, a, b):
+    """Evaluate a limit made of segments that are linear in dB versus log frequency
+
+    Segment i is a[i] + b[i]*log10(f) and covers bp[i-1] <= f < bp[i]. The segment
+    of every sample is looked up with np.searchsorted instead of testing each branch.
+
+    Args:
+        f: frequencies (float64 np.ndarray)
+        bp: ascending breakpoints between the segments (np.ndarray, one less than a)
+        a: intercept of each segment (np.ndarray)
+        b: slope of each segment per decade (np.ndarray)
+
+    Returns:
+        np.ndarray of the limit at f
+    """
+    idx = np.searchsorted(bp, f, side='right')
+    return a[idx] + b[idx]*np.log10(f)
+
+
+def const_limit(fmin, fmax, value):
+    """Create a limit function that is constant over a frequency range
+
+    Args:
+        fmin: lowest frequency the limit is defined at
+        fmax: highest frequency the limit is defined at
+        value: limit value across the range
+
+    Returns:
+        limit function following the same f=None / np.ndarray / float
+        convention as the other limit functions
+    """
+    @limit(fmin, fmax, [fmin, fmax])
+    def const(f):
+        return np.full(f.shape, value, dtype=np.float64)
+    return const
+
+
 # End of file
\ No newline at end of file
@@ -0,0 +1,66 @@
+# Tests for ISO_plotlib.ISO_Plots.feval
+#
+# Run with: python -m unittest test_ISO_plotlib
+
+import unittest
+import numpy as np
+from ISO_plotlib import ISO_Plots, limit
+
+
+# vectorized limit: 2*f over 1 to 10
+@limit(1.0, 10.0, [1.0, 10.0])
+def double_limit(f):
+    return 2.0*f
+
+
+# scalar-only function: None outside 1 to 10
+def double_scalar(f):
+    assert type(f) is float
+    if f<1.0 or f>10.0:
+        return None
+    return 2.0*f
+
+
+class TestFeval(unittest.TestCase):
+
+    def test_none_raises(self):
+        for fun in (double_limit, double_scalar):
+            with self.assertRaises(Exception):
+                ISO_Plots.feval(None, fun)
+
+    def test_object_input_raises(self):
+        for x in ("5", [1.0, None], np.array([1.0, 2.0], dtype=object), {"f": 1.0}):
+            with self.assertRaises(Exception):
+                ISO_Plots.feval(x, double_limit)
+
+    def test_int(self):
+        for fun in (double_limit, double_scalar):
+            y = ISO_Plots.feval(5, fun)
+            self.assertIs(type(y), float)
+            self.assertEqual(y, 10.0)
+
+    def test_numpy_scalar(self):
+        for x in (np.float64(5.0), np.float32(5.0), np.int64(5), np.array(5.0)):
+            for fun in (double_limit, double_scalar):
+                y = ISO_Plots.feval(x, fun)
+                self.assertIs(type(y), float)
+                self.assertEqual(y, 10.0)
+
+    def test_scalar_out_of_range(self):
+        self.assertIsNone(ISO_Plots.feval(20.0, double_limit))
+        self.assertIsNone(ISO_Plots.feval(20.0, double_scalar))
+
+    def test_list(self):
+        for fun in (double_limit, double_scalar):
+            y = ISO_Plots.feval([1, 5.0, 20.0], fun)
+            self.assertIsInstance(y, np.ndarray)
+            np.testing.assert_array_equal(y, [2.0, 10.0, np.nan])
+
+    def test_2d_array(self):
+        x = np.array([[1.0, 2.0], [3.0, 20.0]])
+        for fun in (double_limit, double_scalar):
+            np.testing.assert_array_equal(ISO_Plots.feval(x, fun), [[2.0, 4.0], [6.0, np.nan]])
+
+
+if __name__ == "__main__":
+    unittest.main()